@@ -2,9 +2,15 @@
 Simple keyboard client for teleoperation
 """
 import requests
+import numpy as np
+from requests.adapters import HTTPAdapter
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.client import connect as ws_connect
 import time
-import json
+import orjson
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 import sys
 import os
@@ -12,23 +18,36 @@ import tty
 import termios
 import select
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from server.models import DeltaCommand, ReferenceFrame
-
 
 class Getch:
-    """Gets a single character from standard input. Does not echo to the screen."""
+    """
+    Gets a single character from standard input. Does not echo to the screen.
+    
+    Use as a context manager so the terminal enters raw mode once for the whole
+    session rather than around every read:
+    
+        with Getch() as read:
+            ch = read()
+    """
+    def __init__(self):
+        self.fd = sys.stdin.fileno()
+        self.old_settings = None
+    
+    def __enter__(self):
+        self.old_settings = termios.tcgetattr(self.fd)
+        tty.setraw(self.fd)
+        # Keep output post-processing so prints still get carriage returns
+        attrs = termios.tcgetattr(self.fd)
+        attrs[tty.OFLAG] |= termios.OPOST
+        termios.tcsetattr(self.fd, termios.TCSANOW, attrs)
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        termios.tcsetattr(self.fd, termios.TCSADRAIN, self.old_settings)
+        return False
+    
     def __call__(self):
-        fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
-        try:
-            tty.setraw(sys.stdin.fileno())
-            ch = sys.stdin.read(1)
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-        return ch
+        return os.read(self.fd, 1).decode(errors='ignore')
 
 
 class ControlMode(Enum):
@@ -41,118 +60,174 @@ class KeyboardTeleopClient:
     
     def __init__(self, server_url: str = "http://localhost:8000"):
         self.server_url = server_url
+        self._cmd_url = f"{server_url}/api/v1/command"
+        self._batch_url = f"{server_url}/api/v1/command/batch"
+        self._safety_url = f"{server_url}/api/v1/safety/activate"
+        self._root_url = f"{server_url}/"
+        # http:// -> ws://, https:// -> wss://; stream=0 skips the server's state/video push
+        self._ws_url = f"ws{server_url[4:]}/ws/v1/teleop?stream=0"
+        
+        # DeltaCommand wire format; only the six deltas and the timestamp change per tick.
+        # max_velocity is above the model default since we send frequent small updates.
+        self._json_fmt = (b'{"dx":%.6f,"dy":%.6f,"dz":%.6f,'
+                          b'"droll":%.6f,"dpitch":%.6f,"dyaw":%.6f,'
+                          b'"reference_frame":"end_effector",'
+                          b'"max_velocity":0.5,"max_angular_velocity":1.0,'
+                          b'"timestamp":%.6f,"client_id":"keyboard_client"}')
+        self._json_headers = {"Content-Type": "application/json"}
+        
         self.running = False
         self.control_mode = ControlMode.POSITION
-        self.sender_thread = None
         self.send_frequency = 20.0  # Hz
         
         # Control increments
         self.position_increment = 0.02  # meters
         self.orientation_increment = 0.05  # radians
         
-        # Current accumulated command values (thread-safe access needed)
-        self.command_lock = threading.Lock()
-        self.dx = 0.0
-        self.dy = 0.0
-        self.dz = 0.0
-        self.droll = 0.0
-        self.dpitch = 0.0
-        self.dyaw = 0.0
+        # Current accumulated command [dx, dy, dz, droll, dpitch, dyaw]
+        # (only touched by the input loop)
+        self.state = np.zeros(6, dtype=np.float64)
         
-        self.getch = Getch()
+        # Persistent keep-alive session so each 20 Hz command reuses one connection
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
         
-        # Key mapping
-        self.key_actions = {
-            'w': ('dz', self.position_increment),
-            's': ('dz', -self.position_increment),
-            'a': ('dx', -self.position_increment),
-            'd': ('dx', self.position_increment),
-            'q': ('dy', self.position_increment),
-            'e': ('dy', -self.position_increment),
-            
-            'i': ('dpitch', -self.orientation_increment),
-            'k': ('dpitch', self.orientation_increment),
-            'j': ('dyaw', self.orientation_increment),
-            'l': ('dyaw', -self.orientation_increment),
-            'u': ('droll', -self.orientation_increment),
-            'o': ('droll', self.orientation_increment),
+        # HTTP calls run on a worker so a slow server never stalls the send cadence.
+        # Commands queue up while a request is in flight and the next flush sends
+        # them together to the batch endpoint (5 s at 20 Hz; the server rejects
+        # anything older anyway).
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending_bodies = deque(maxlen=100)
+        self._flush_future = None
+        
+        # Optional WebSocket command stream, preferred over HTTP while it is open
+        self.ws = None
+        self._ws_thread = None
+        
+        # Key mapping: every key is a 6-vector delta; the active mode's mask zeroes
+        # the components that do not belong to it
+        p = self.position_increment
+        o = self.orientation_increment
+        self.key_delta = {
+            'w': np.array([0.0, 0.0, p, 0.0, 0.0, 0.0]),
+            's': np.array([0.0, 0.0, -p, 0.0, 0.0, 0.0]),
+            'a': np.array([-p, 0.0, 0.0, 0.0, 0.0, 0.0]),
+            'd': np.array([p, 0.0, 0.0, 0.0, 0.0, 0.0]),
+            'q': np.array([0.0, p, 0.0, 0.0, 0.0, 0.0]),
+            'e': np.array([0.0, -p, 0.0, 0.0, 0.0, 0.0]),
             
+            'i': np.array([0.0, 0.0, 0.0, 0.0, -o, 0.0]),
+            'k': np.array([0.0, 0.0, 0.0, 0.0, o, 0.0]),
+            'j': np.array([0.0, 0.0, 0.0, 0.0, 0.0, o]),
+            'l': np.array([0.0, 0.0, 0.0, 0.0, 0.0, -o]),
+            'u': np.array([0.0, 0.0, 0.0, -o, 0.0, 0.0]),
+            'o': np.array([0.0, 0.0, 0.0, o, 0.0, 0.0]),
+        }
+        self.position_mask = np.array([1.0, 1.0, 1.0, 0.0, 0.0, 0.0])
+        self.orientation_mask = np.array([0.0, 0.0, 0.0, 1.0, 1.0, 1.0])
+        self.mode_mask = self.position_mask
+        self.key_callbacks = {
             'm': self.toggle_mode,
             'r': self.reset_command,
             '1': self.activate_safety,    # New: manually activate safety
         }
 
-    def start_sender_loop(self):
-        """Start background thread to send commands at fixed frequency"""
-        self.running = True
+    def send_accumulated(self):
+        """Snapshot the accumulated deltas, reset them and send to the server"""
+        body = self._json_fmt % (*self.state, time.time())
         
-        def sender_loop():
-            print(f"Sender loop started at {self.send_frequency} Hz")
-            interval = 1.0 / self.send_frequency
-            
-            while self.running:
-                start_time = time.time()
-                
-                # Prepare command
-                with self.command_lock:
-                    command = DeltaCommand(
-                        dx=self.dx, dy=self.dy, dz=self.dz,
-                        droll=self.droll, dpitch=self.dpitch, dyaw=self.dyaw,
-                        reference_frame=ReferenceFrame.END_EFFECTOR,
-                        max_velocity=0.5, # Allow higher max since we send frequent small updates
-                        max_angular_velocity=1.0,
-                        timestamp=time.time(),
-                        client_id="keyboard_client"
-                    )
-                    
-                    # Reset accumulators
-                    self.dx = 0.0
-                    self.dy = 0.0
-                    self.dz = 0.0
-                    self.droll = 0.0
-                    self.dpitch = 0.0
-                    self.dyaw = 0.0
-                
-                # Send command (even if zero - acts as keep-alive)
+        # Reset accumulators
+        self.state[:] = 0.0
+        
+        # Send command (even if zero - acts as keep-alive)
+        ws = self.ws
+        if ws is not None:
+            try:
+                ws.send(body.decode())  # Server reads text frames
+                return
+            except Exception:
+                # Stream dropped, release it and fall back to HTTP
+                self.ws = None
                 try:
-                    self.send_command(command)
-                except Exception as e:
+                    ws.close()
+                except Exception:
                     pass
-                
-                # Sleep remainder
-                elapsed = time.time() - start_time
-                sleep_time = max(0, interval - elapsed)
-                time.sleep(sleep_time)
         
-        self.sender_thread = threading.Thread(target=sender_loop, daemon=True)
-        self.sender_thread.start()
+        self._pending_bodies.append(body)
+        if self._flush_future is None or self._flush_future.done():
+            self._flush_future = self._executor.submit(self.flush_pending)
 
-    def stop_sender_loop(self):
-        self.running = False
-        if self.sender_thread:
-            self.sender_thread.join(timeout=1.0)
+    def flush_pending(self):
+        """Send every queued command, batching them if more than one is waiting"""
+        bodies = []
+        while self._pending_bodies:
+            bodies.append(self._pending_bodies.popleft())
+        
+        if len(bodies) == 1:
+            self.send_command(bodies[0])
+        elif bodies:
+            self.send_batch(bodies)
+
+    def open_command_stream(self) -> bool:
+        """Open the WebSocket command stream; returns False if HTTP must be used"""
+        try:
+            ws = ws_connect(self._ws_url, open_timeout=2)
+        except Exception as e:
+            print(f"WebSocket unavailable ({e}), sending commands over HTTP")
+            return False
+        
+        # The server accepts the connection and then closes it (code 4401) when
+        # auth is enabled, so wait briefly for an early close before using it
+        try:
+            ws.recv(timeout=0.2)
+        except TimeoutError:
+            pass
+        except ConnectionClosed as e:
+            reason = "auth required" if e.rcvd and e.rcvd.code == 4401 else "closed by server"
+            print(f"WebSocket unavailable ({reason}), sending commands over HTTP")
+            return False
+        
+        self.ws = ws
+        self._ws_thread = threading.Thread(target=self._drain_acks, daemon=True)
+        self._ws_thread.start()
+        print("✓ Streaming commands over WebSocket")
+        return True
+    
+    def _drain_acks(self):
+        """Read acks from the command stream and report violations"""
+        ws = self.ws
+        try:
+            for message in ws:
+                msg = orjson.loads(message)
+                if msg.get('type') == 'ack':
+                    self.report_violations(msg.get('result', {}))
+        except Exception:
+            pass
+        # Server closed the stream (e.g. auth required), fall back to HTTP
+        if self.ws is ws:
+            self.ws = None
 
     def toggle_mode(self):
         """Toggle between position and orientation control"""
         if self.control_mode == ControlMode.POSITION:
             self.control_mode = ControlMode.ORIENTATION
+            self.mode_mask = self.orientation_mask
             print("Switched to ORIENTATION control mode")
         else:
             self.control_mode = ControlMode.POSITION
+            self.mode_mask = self.position_mask
             print("Switched to POSITION control mode")
     
     def reset_command(self):
         """Reset all command values to zero"""
-        with self.command_lock:
-            self.dx = self.dy = self.dz = 0.0
-            self.droll = self.dpitch = self.dyaw = 0.0
+        self.state[:] = 0.0
         print("Command reset to zero")
     
     def activate_safety(self):
         """Manually activate safety gate"""
         try:
-            response = requests.post(
-                f"{self.server_url}/api/v1/safety/activate",
+            response = self.session.post(
+                self._safety_url,
                 timeout=1
             )
             if response.status_code == 200:
@@ -162,24 +237,18 @@ class KeyboardTeleopClient:
         except Exception as e:
             print(f"Error activating safety: {e}")
     
-    def send_command(self, command: DeltaCommand):
-        """Send command to server"""
+    def send_command(self, body: bytes):
+        """Send a serialized DeltaCommand JSON body to server"""
         try:
-            # Use model_dump() instead of dict() for Pydantic v2
-            response = requests.post(
-                f"{self.server_url}/api/v1/command",
-                json=command.model_dump(),
+            response = self.session.post(
+                self._cmd_url,
+                data=body,
+                headers=self._json_headers,
                 timeout=0.5
             )
             
             if response.status_code == 200:
-                result = response.json()
-                if result.get('violations', {}):
-                    for violation, active in result['violations'].items():
-                        if active:
-                            # We might want to suppress this if it spams too much at 20Hz
-                            # But for now it's useful feedback
-                            print(f"\r⚠️  {violation.upper()} VIOLATION!   ", end="", flush=True)
+                self.report_violations(orjson.loads(response.content))
                 return True
             else:
                 # print(f"Server error {response.status_code}: {response.text}")
@@ -192,26 +261,46 @@ class KeyboardTeleopClient:
             # print(f"Connection error: {e}")
             return False
     
-    def handle_key(self, key: str):
-        """Handle a key press"""
-        if key in self.key_actions:
-            action = self.key_actions[key]
+    def send_batch(self, bodies: list):
+        """Send several serialized DeltaCommand JSON bodies in one request"""
+        try:
+            response = self.session.post(
+                self._batch_url,
+                data=b"[" + b",".join(bodies) + b"]",
+                headers=self._json_headers,
+                timeout=0.5
+            )
             
-            if callable(action):
-                action()
+            if response.status_code == 200:
+                for result in orjson.loads(response.content).get('results', []):
+                    self.report_violations(result)
+                return True
             else:
-                attr, value = action
+                return False
                 
-                with self.command_lock:
-                    # Apply based on control mode
-                    if self.control_mode == ControlMode.POSITION:
-                        if attr.startswith('d') and not attr.startswith('dr') and not attr.startswith('dp') and not attr.startswith('dy'):
-                            current_value = getattr(self, attr)
-                            setattr(self, attr, current_value + value)
-                    else:  # orientation mode
-                        if attr.startswith('dr') or attr.startswith('dp') or attr.startswith('dy'):
-                            current_value = getattr(self, attr)
-                            setattr(self, attr, current_value + value)
+        except requests.exceptions.RequestException:
+            return False
+    
+    def report_violations(self, result: dict):
+        """Print any violations flagged in a command result"""
+        if result.get('violations', {}):
+            for violation, active in result['violations'].items():
+                if active:
+                    # We might want to suppress this if it spams too much at 20Hz
+                    # But for now it's useful feedback
+                    print(f"\r⚠️  {violation.upper()} VIOLATION!   ", end="", flush=True)
+    
+    def handle_key(self, key: str):
+        """Handle a key press"""
+        action = self.key_callbacks.get(key)
+        if action is not None:
+            action()
+            return
+        
+        # Apply based on control mode
+        delta = self.key_delta.get(key)
+        if delta is not None:
+            self.state += delta * self.mode_mask
 
     def print_help(self):
         """Print control help"""
@@ -251,40 +340,62 @@ class KeyboardTeleopClient:
         print("\nActivating safety gate...")
         self.activate_safety()
         
-        # Start sender loop
-        self.start_sender_loop()
+        # Prefer a single WebSocket for the 20 Hz command stream
+        self.open_command_stream()
         
         print(f"\nReady for input. Press keys to move. Ctrl+C to exit.")
+        print(f"Sending commands at {self.send_frequency} Hz")
+        
+        interval = 1.0 / self.send_frequency
         
         try:
-            while self.running:
-                # Blocking read of single character
-                char = self.getch()
-                
-                # Handle special keys
-                if char == '\x03':  # Ctrl+C
-                    raise KeyboardInterrupt
-                
-                # Map to lower case
-                key = char.lower()
-                
-                if key == 'h':
-                    self.print_help()
-                else:
-                    self.handle_key(key)
+            with Getch() as read:
+                # Deadlines advance by a fixed interval on the monotonic clock so sleep
+                # overshoot does not accumulate; after an overrun we re-anchor instead
+                # of bursting to catch up
+                next_send_time = time.monotonic()
+                while self.running:
+                    # Wait for a key, but never past the next send deadline
+                    timeout = next_send_time - time.monotonic()
+                    r, _, _ = select.select([sys.stdin], [], [], max(0, timeout))
+                    
+                    if sys.stdin in r:
+                        char = read()
+                        
+                        # Handle special keys
+                        if char == '\x03':  # Ctrl+C
+                            raise KeyboardInterrupt
+                        
+                        # Map to lower case
+                        key = char.lower()
+                        
+                        if key == 'h':
+                            self.print_help()
+                        else:
+                            self.handle_key(key)
+                    
+                    now = time.monotonic()
+                    if now >= next_send_time:
+                        self.send_accumulated()
+                        next_send_time += interval
+                        if next_send_time <= now:
+                            next_send_time = now + interval
                     
         except KeyboardInterrupt:
             print("\n\nExiting...")
         except Exception as e:
             print(f"Error: {e}")
         finally:
-            self.stop_sender_loop()
+            self.running = False
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            if self.ws is not None:
+                self.ws.close()
     
     def test_connection(self) -> bool:
         """Test connection to server"""
         try:
-            print(f"DEBUG: Connecting to {self.server_url}/ ...")
-            response = requests.get(f"{self.server_url}/", timeout=5)
+            print(f"DEBUG: Connecting to {self._root_url} ...")
+            response = self.session.get(self._root_url, timeout=5)
             print(f"DEBUG: Status code: {response.status_code}")
             return response.status_code == 200
         except Exception as e:
@@ -2,19 +2,41 @@
 Simple terminal monitor to visualize robot state
 """
 import requests
+import orjson
+from requests.adapters import HTTPAdapter
 import time
 import sys
 import os
 
+# Configuration
+SERVER_URL = "http://localhost:8000"
+STATISTICS_URL = f"{SERVER_URL}/api/v1/statistics"
+
+# main() polls every 200 ms from one loop, so a single kept-alive socket is enough
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
 
-def get_status(url="http://localhost:8000"):
+# Last statistics body and its ETag, reused when the server answers 304
+_etag = None
+_cached_stats = None
+
+def get_status(url=SERVER_URL):
+    global _etag, _cached_stats
+    # The default server's endpoint is built once at module level
+    stats_url = STATISTICS_URL if url == SERVER_URL else f"{url}/api/v1/statistics"
     try:
         # Get statistics which includes backend status and controller stats
-        response = requests.get(f"{url}/api/v1/statistics", timeout=0.5)
+        headers = {"If-None-Match": _etag} if _etag else None
+        response = SESSION.get(stats_url, headers=headers, timeout=0.5)
+        if response.status_code == 304:
+            return _cached_stats
         if response.status_code == 200:
-            return response.json()
+            _cached_stats = orjson.loads(response.content)
+            _etag = response.headers.get("ETag")
+            return _cached_stats
     except:
         return None
     return None
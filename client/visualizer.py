@@ -5,14 +5,21 @@ import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 import matplotlib.animation as animation
 import requests
+import orjson
+from requests.adapters import HTTPAdapter
 import numpy as np
 import time
 import threading
 
 # Configuration
 SERVER_URL = "http://localhost:8000"
+STATISTICS_URL = f"{SERVER_URL}/api/v1/statistics"
 UPDATE_INTERVAL = 100  # ms
 
+# Only poll_data's background thread talks to the server
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
 # Workspace Limits (should match server/models.py)
 WS_MIN_X, WS_MAX_X = -1.0, 1.0
 WS_MIN_Y, WS_MAX_Y = -1.0, 1.0
@@ -25,9 +32,13 @@ class TeleopVisualizer:
         
         # Data
         self.position = np.array([0.0, 0.0, 0.5])
-        self.trajectory = []
         self.max_trajectory_length = 100
+        # Fixed-size ring buffer of recent positions; _traj_head is the next slot
+        self.trajectory = np.empty((self.max_trajectory_length, 3), dtype=np.float64)
+        self._traj_head = 0
+        self._traj_size = 0
         self.connected = False
+        self._etag = None  # ETag of the last statistics response
         
         # Setup plot
         self.setup_plot()
@@ -94,9 +105,14 @@ class TeleopVisualizer:
         """Poll server for robot status"""
         while self.running:
             try:
-                response = requests.get(f"{SERVER_URL}/api/v1/statistics", timeout=0.5)
-                if response.status_code == 200:
-                    data = response.json()
+                headers = {"If-None-Match": self._etag} if self._etag else None
+                response = SESSION.get(STATISTICS_URL, headers=headers, timeout=0.5)
+                if response.status_code == 304:
+                    # Nothing changed since the last poll
+                    self.connected = True
+                elif response.status_code == 200:
+                    self._etag = response.headers.get("ETag")
+                    data = orjson.loads(response.content)
                     # Check where the position is stored based on server response structure
                     # server/teleop_server.py: get_statistics returns:
                     # 'backend_status': self.backend.get_status() -> 'current_position'
@@ -109,9 +125,7 @@ class TeleopVisualizer:
                         self.connected = True
                         
                         # Update trajectory
-                        self.trajectory.append(self.position)
-                        if len(self.trajectory) > self.max_trajectory_length:
-                            self.trajectory.pop(0)
+                        self.append_trajectory(self.position)
                     else:
                         # Fallback to controller stats if backend doesn't have it
                         controller_stats = data.get('controller_stats', {})
@@ -120,9 +134,7 @@ class TeleopVisualizer:
                             self.position = np.array(pos)
                             self.connected = True
                             
-                            self.trajectory.append(self.position)
-                            if len(self.trajectory) > self.max_trajectory_length:
-                                self.trajectory.pop(0)
+                            self.append_trajectory(self.position)
                 else:
                     self.connected = False
             except Exception as e:
@@ -131,6 +143,13 @@ class TeleopVisualizer:
             
             time.sleep(0.1)
 
+    def append_trajectory(self, pos):
+        """Append a position to the trajectory ring buffer"""
+        self.trajectory[self._traj_head] = pos
+        self._traj_head = (self._traj_head + 1) % self.max_trajectory_length
+        if self._traj_size < self.max_trajectory_length:
+            self._traj_size += 1
+
     def update_plot(self, frame):
         """Update the plot with new data"""
         # Update title with connection status and position
@@ -142,8 +161,13 @@ class TeleopVisualizer:
         self.scat._offsets3d = ([self.position[0]], [self.position[1]], [self.position[2]])
         
         # Update trajectory
-        if len(self.trajectory) > 1:
-            traj_arr = np.array(self.trajectory)
+        if self._traj_size > 1:
+            if self._traj_size < self.max_trajectory_length:
+                # Copy so matplotlib never holds a view the poll thread writes into
+                traj_arr = self.trajectory[:self._traj_size].copy()
+            else:
+                # Buffer has wrapped, rotate so the oldest sample comes first
+                traj_arr = np.roll(self.trajectory, -self._traj_head, axis=0)
             self.traj_line.set_data(traj_arr[:, 0], traj_arr[:, 1])
             self.traj_line.set_3d_properties(traj_arr[:, 2])
             
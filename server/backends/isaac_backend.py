@@ -25,12 +25,15 @@ class IsaacSimBackend(RobotBackend):
         self.host = host
         self.port = port
         
-        # State
-        self.current_position = np.array([0.0, 0.0, 0.5])
-        self.current_orientation = np.array([1.0, 0.0, 0.0, 0.0])
+        # State. The pose [x, y, z, qw, qx, qy, qz] lives in one buffer guarded by a
+        # seqlock: the receive thread is the only writer and bumps _seq to odd while
+        # writing, readers retry until they see the same even value on both sides.
+        self._pose_buf = np.array([0.0, 0.0, 0.5, 1.0, 0.0, 0.0, 0.0])
+        self._seq = 0
+        # Plain-float (position, orientation) lists for get_status, swapped as one tuple
+        self._status_pose = ([0.0, 0.0, 0.5], [1.0, 0.0, 0.0, 0.0])
         self.command_count = 0
         self.last_error: Optional[str] = None
-        self.lock = threading.Lock()
         
         # Network
         self.server_socket = None
@@ -94,10 +97,9 @@ class IsaacSimBackend(RobotBackend):
                 client_sock, address = self.server_socket.accept()
                 print(f"[IsaacBackend] Client connected from {address}")
                 
-                with self.lock:
-                    self.client_socket = client_sock
-                    self.client_address = address
-                    self.status = BackendStatus.CONNECTED
+                self.client_socket = client_sock
+                self.client_address = address
+                self.status = BackendStatus.CONNECTED
                 
                 # Start receiver for this client
                 self._receive_loop()
@@ -129,9 +131,8 @@ class IsaacSimBackend(RobotBackend):
                 break
         
         print(f"[IsaacBackend] Client disconnected")
-        with self.lock:
-            self.client_socket = None
-            self.status = BackendStatus.CONNECTING  # Go back to listening
+        self.client_socket = None
+        self.status = BackendStatus.CONNECTING  # Go back to listening
 
     def _process_message(self, message: str):
         """Process incoming JSON message"""
@@ -139,15 +140,37 @@ class IsaacSimBackend(RobotBackend):
             data = json.loads(message)
             if data.get('type') == 'state':
                 payload = data.get('payload', {})
-                pos = payload.get('position')
-                orient = payload.get('orientation')
+                pos = payload.get('position') or None
+                orient = payload.get('orientation') or None
+                
+                # Convert and shape-check before entering the write section so a
+                # malformed message cannot leave _seq odd and wedge readers
+                if pos is not None:
+                    pos = np.asarray(pos, dtype=float)
+                    if pos.shape != (3,):
+                        raise ValueError(f"position must have 3 values, got shape {pos.shape}")
+                if orient is not None:
+                    orient = np.asarray(orient, dtype=float)
+                    if orient.shape != (4,):
+                        raise ValueError(f"orientation must have 4 values, got shape {orient.shape}")
                 
-                with self.lock:
-                    if pos:
-                        self.current_position = np.array(pos)
-                    if orient:
-                        self.current_orientation = np.array(orient)
-                    self.last_update_time = time.time()
+                self._seq += 1
+                try:
+                    if pos is not None:
+                        self._pose_buf[:3] = pos
+                    if orient is not None:
+                        self._pose_buf[3:] = orient
+                finally:
+                    self._seq += 1
+                
+                position_list, orientation_list = self._status_pose
+                if pos is not None:
+                    position_list = [float(pos[0]), float(pos[1]), float(pos[2])]
+                if orient is not None:
+                    orientation_list = [float(orient[0]), float(orient[1]),
+                                        float(orient[2]), float(orient[3])]
+                self._status_pose = (position_list, orientation_list)
+                self.last_update_time = time.time()
                     
         except json.JSONDecodeError:
             pass
@@ -173,27 +196,42 @@ class IsaacSimBackend(RobotBackend):
             data = json.dumps(message) + "\n"
             self.client_socket.sendall(data.encode('utf-8'))
             
-            with self.lock:
-                self.command_count += 1
+            self.command_count += 1
                 
             return True
         except Exception as e:
             print(f"[IsaacBackend] Send error: {e}")
-            with self.lock:
-                self.last_error = str(e)
+            self.last_error = str(e)
             return False
 
+    def _read_pose(self) -> np.ndarray:
+        """Return a consistent copy of the pose buffer without taking a lock"""
+        while True:
+            before = self._seq
+            if before & 1:
+                time.sleep(0)  # Writer mid-update, yield and retry
+                continue
+            pose = self._pose_buf.copy()
+            if self._seq == before:
+                return pose
+
     def get_current_pose(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
-        with self.lock:
-            return self.current_position.copy(), self.current_orientation.copy()
+        """
+        Get current pose as read-only views of a single snapshot.
+        Callers must copy the returned arrays before mutating them.
+        """
+        pose = self._read_pose()
+        pose.flags.writeable = False
+        return pose[:3], pose[3:]
 
     def get_status(self) -> Dict[str, Any]:
+        position_list, orientation_list = self._status_pose
         return {
             "name": self.name,
             "status": self.status.value,
             "command_count": self.command_count,
-            "current_position": self.current_position.tolist(),
-            "current_orientation": self.current_orientation.tolist(),
+            "current_position": position_list,
+            "current_orientation": orientation_list,
             "last_error": self.last_error,
             "last_update": self.last_update_time,
             "endpoint": f"{self.host}:{self.port}",
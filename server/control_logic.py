@@ -78,7 +78,7 @@ class TeleoperationController:
         )
         
         # Check if velocity limiting was applied
-        if not np.allclose(delta_pos, delta_pos_limited) or not np.allclose(delta_euler, delta_euler_limited):
+        if self.velocity_limiter.last_limited:
             violations['velocity_violation'] = True
             self.velocity_violations += 1
         
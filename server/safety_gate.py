@@ -1,6 +1,7 @@
 """
 Safety mechanisms for teleoperation
 """
+import math
 import time
 from typing import Optional, Callable
 import numpy as np
@@ -34,14 +35,16 @@ class SafetyGate:
         Returns:
             True if safety gate is active
         """
-        linear_magnitude = np.linalg.norm(command[:3])
-        angular_magnitude = np.linalg.norm(command[3:])
-        command_magnitude = max(linear_magnitude, angular_magnitude)
+        # Compare squared magnitudes to avoid sqrt on every command
+        lin2 = command[0]*command[0] + command[1]*command[1] + command[2]*command[2]
+        ang2 = command[3]*command[3] + command[4]*command[4] + command[5]*command[5]
+        mag2 = lin2 if lin2 > ang2 else ang2
+        thr2 = self.activation_threshold * self.activation_threshold
         
         # Consider both linear and angular deltas, and allow equality
-        if command_magnitude >= self.activation_threshold:
+        if mag2 >= thr2:
             self.last_heartbeat = timestamp
-            self.last_command_magnitude = command_magnitude
+            self.last_command_magnitude = math.sqrt(mag2)
             return True
         elif self.last_heartbeat is not None and (timestamp - self.last_heartbeat) < self.timeout:
             # Still within timeout window
@@ -81,6 +84,7 @@ class VelocityLimiter:
                  max_angular_velocity: float = 1.0):
         self.max_linear = max_linear_velocity
         self.max_angular = max_angular_velocity
+        self.last_limited: bool = False
         
     def set_limits(self, max_linear_velocity: float, max_angular_velocity: float):
         self.max_linear = max_linear_velocity
@@ -89,7 +93,7 @@ class VelocityLimiter:
     def limit(self, delta_pos: np.ndarray, delta_rot: np.ndarray,
               dt: float = 0.1) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Limit velocity to safe ranges
+        Limit velocity to safe ranges. Deltas are scaled in place.
         
         Args:
             delta_pos: [dx, dy, dz]
@@ -97,19 +101,23 @@ class VelocityLimiter:
             dt: time step in seconds
             
         Returns:
-            Limited delta_pos, delta_rot
+            Limited delta_pos, delta_rot (the same arrays that were passed in)
         """
-        # Calculate current velocities
-        linear_velocity = np.linalg.norm(delta_pos) / dt if dt > 0 else 0
-        angular_velocity = np.linalg.norm(delta_rot) / dt if dt > 0 else 0
+        self.last_limited = False
+        if dt <= 0:
+            return delta_pos, delta_rot
         
-        # Apply limits
-        if linear_velocity > self.max_linear:
-            scale = self.max_linear / linear_velocity
-            delta_pos = delta_pos * scale
+        # Compare squared norms against the squared per-step limits
+        max_step = self.max_linear * dt
+        lin2 = float(delta_pos @ delta_pos)
+        if lin2 > max_step * max_step:
+            delta_pos *= max_step / math.sqrt(lin2)
+            self.last_limited = True
             
-        if angular_velocity > self.max_angular:
-            scale = self.max_angular / angular_velocity
-            delta_rot = delta_rot * scale
+        max_step = self.max_angular * dt
+        ang2 = float(delta_rot @ delta_rot)
+        if ang2 > max_step * max_step:
+            delta_rot *= max_step / math.sqrt(ang2)
+            self.last_limited = True
             
         return delta_pos, delta_rot
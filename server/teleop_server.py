@@ -48,6 +48,7 @@ class TeleoperationServer:
         self.start_time = time.time()
         self.total_commands = 0
         self.last_violations = {}
+        self.last_command_timestamp: Optional[float] = None  # Client timestamp of last processed command
         
         # Threading
         self._stop_event = threading.Event()
@@ -81,12 +82,15 @@ class TeleoperationServer:
         
         print("[Server] Shutdown complete")
     
-    def process_command(self, command: DeltaCommand) -> Dict[str, Any]:
+    def process_command(self, command: DeltaCommand,
+                        current_time: Optional[float] = None) -> Dict[str, Any]:
         """
         Process a teleoperation command
         
         Args:
             command: Delta command from client
+            current_time: Time used by the controller for velocity limiting
+                          (uses time.time() if None)
             
         Returns:
             Processing result with status and any violations
@@ -105,7 +109,8 @@ class TeleoperationServer:
             }
         
         # Process command through controller
-        target_position, target_orientation, violations = self.controller.process_command(command)
+        target_position, target_orientation, violations = self.controller.process_command(command, current_time)
+        self.last_command_timestamp = command.timestamp
         
         # Send to robot backend
         if self.backend and self.backend.is_connected():
@@ -140,7 +145,9 @@ class TeleoperationServer:
         """Get current server status"""
         safety_active = self.safety_gate.is_active()
         
-        return TeleopStatus(
+        # Every field comes from server state, so skip validation; this runs
+        # at 20 Hz for each WebSocket client
+        return TeleopStatus.model_construct(
             is_active=safety_active,
             safety_gate_active=safety_active,
             last_command_time=self.controller.last_command_time or 0.0,
@@ -226,6 +233,17 @@ def get_server() -> TeleoperationServer:
     return _server_instance
 
 
+TIMESTAMP_TOLERANCE = 5.0  # seconds
+
+
+def _check_timestamp(command: DeltaCommand, current_time: float) -> bool:
+    """Fill in a missing command timestamp and check it is close to server time"""
+    if command.timestamp <= 0:
+        command.timestamp = current_time
+        return True
+    return abs(command.timestamp - current_time) <= TIMESTAMP_TOLERANCE
+
+
 @app.post("/api/v1/command")
 async def send_command(command: DeltaCommand):
     """
@@ -239,10 +257,7 @@ async def send_command(command: DeltaCommand):
     server = get_server()
     
     # Validate timestamp
-    current_time = time.time()
-    if command.timestamp <= 0:
-        command.timestamp = current_time
-    elif abs(command.timestamp - current_time) > 5.0:  # 5 second tolerance
+    if not _check_timestamp(command, time.time()):
         return {"error": "Timestamp too far from server time"}
     
     # Process command
@@ -254,6 +269,44 @@ async def send_command(command: DeltaCommand):
     return result
 
 
+@app.post("/api/v1/command/batch")
+async def send_command_batch(commands: List[DeltaCommand]):
+    """
+    Send several teleoperation commands in one request, processed in order
+    
+    Used by clients to flush commands that queued up while the link stalled.
+    Commands are integrated on the server clock, spaced by the gaps between
+    their client timestamps, so velocity limiting sees the original send
+    cadence rather than back-to-back processing.
+    """
+    server = get_server()
+    
+    current_time = time.time()
+    valid = [_check_timestamp(command, current_time) for command in commands]
+    valid_timestamps = [c.timestamp for c, ok in zip(commands, valid) if ok]
+    last_timestamp = valid_timestamps[-1] if valid_timestamps else current_time
+    
+    results = []
+    for command, ok in zip(commands, valid):
+        if not ok:
+            results.append({"error": "Timestamp too far from server time"})
+            continue
+        
+        # Only client timestamp differences are used, never the client clock itself.
+        # Anchor the batch so its last command lands at the current time, but never
+        # map a command before the previously processed one: if the batch overlaps
+        # it (e.g. a late single POST), space it from there by the client gap.
+        command_time = current_time - max(last_timestamp - command.timestamp, 0.0)
+        prev_time = server.controller.last_command_time
+        if prev_time is not None and command_time <= prev_time:
+            gap = command.timestamp - (server.last_command_timestamp or command.timestamp)
+            command_time = min(prev_time + max(gap, 0.0), current_time)
+        
+        results.append(server.process_command(command, current_time=command_time))
+    
+    return {"results": results}
+
+
 @app.get("/api/v1/status")
 async def get_status():
     """Get current teleoperation status"""
@@ -304,9 +357,15 @@ async def websocket_endpoint(websocket: WebSocket):
         await websocket.close(code=4401)
         return
     username = token_info.username if token_info else "anonymous"
-    session_id = _recorder.start(username=username)
-    if token:
-        _ws_sessions[token] = session_id
+
+    # Command-only clients pass stream=0 to skip the state/video push and the
+    # session recording that goes with it
+    stream_state = websocket.query_params.get("stream", "1") != "0"
+    session_id = None
+    if stream_state:
+        session_id = _recorder.start(username=username)
+        if token:
+            _ws_sessions[token] = session_id
 
     server = get_server()
 
@@ -351,7 +410,9 @@ async def websocket_endpoint(websocket: WebSocket):
             _recorder.save_frame(session_id, jpg)
             await asyncio.sleep(0.05)
 
-    state_task = asyncio.create_task(state_loop())
+    state_task = None
+    if stream_state:
+        state_task = asyncio.create_task(state_loop())
 
     try:
         while True:
@@ -363,22 +424,29 @@ async def websocket_endpoint(websocket: WebSocket):
                 command_dict = msg
 
             command = DeltaCommand(**command_dict)
-            current_time = time.time()
-            if command.timestamp <= 0:
-                command.timestamp = current_time
 
-            result = server.process_command(command)
+            # Validate timestamp. Only command-only (stream=0) connections are held
+            # to the tolerance, matching the HTTP path they replace; streaming
+            # clients such as the browser UI are processed regardless of skew.
+            if _check_timestamp(command, time.time()) or stream_state:
+                result = server.process_command(command)
+            else:
+                result = {"error": "Timestamp too far from server time"}
+
             ack = {"type": "ack", "ts": time.time(), "result": result}
             await websocket.send_json(ack)
-            _recorder.write(session_id, {"type": "command", "ts": ack["ts"], "command": command_dict, "result": result})
+            if session_id:
+                _recorder.write(session_id, {"type": "command", "ts": ack["ts"], "command": command_dict, "result": result})
 
     except WebSocketDisconnect:
         pass
     except Exception:
         await websocket.close(code=1011)
     finally:
-        state_task.cancel()
-        _recorder.stop(session_id)
+        if state_task:
+            state_task.cancel()
+        if session_id:
+            _recorder.stop(session_id)
 
 
 class LoginRequest(BaseModel):
@@ -449,6 +517,7 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "command": "POST /api/v1/command",
+            "command_batch": "POST /api/v1/command/batch",
             "status": "GET /api/v1/status",
             "statistics": "GET /api/v1/statistics",
             "websocket": "WS /ws/v1/teleop",